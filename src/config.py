@@ -5,6 +5,11 @@ Este módulo carga variables de entorno desde un archivo `.env` y define constan
 utilizadas en todo el proyecto, como URLs de API, credenciales de AWS, fechas de consulta
 y países a analizar.
 
+La configuración se resuelve una sola vez mediante `get_config()` (cacheado),
+que lee el `.env`, congela los valores en un dataclass inmutable y evita
+repetir la lectura/parseo del archivo en re-imports o workers forkeados.
+Las constantes a nivel de módulo se derivan de ese singleton.
+
 Variables principales:
 - BASE_API_URL: URL base de la API de COVID.
 - AWS_ACCESS_KEY_ID: ID de la clave de acceso a AWS.
@@ -12,29 +17,69 @@ Variables principales:
 - AWS_DEFAULT_REGION: Región por defecto de AWS.
 - S3_BUCKET_NAME: Nombre del bucket de S3 donde se almacenan los datos.
 - COVID_DATE: Fecha para consultar datos COVID (YYYY-MM-DD).
-- COUNTRIES: Lista de países en formato ISO-3166-1 alpha-2.
+- COUNTRIES: Países en formato ISO-3166-1 alpha-2.
+- SAVE_LOCAL_COPY: Guardar también una copia local del parquet.
 - RISK_THRESHOLDS: Diccionario con los umbrales de riesgo según casos reportados.
 """
+from dataclasses import dataclass, field
+from functools import cache
 from dotenv import load_dotenv
 import os
 
-# Carga las variables de entorno desde el archivo .env
-load_dotenv()
+@dataclass(frozen=True)
+class Config:
+    """Configuración inmutable del pipeline, resuelta una sola vez."""
+    base_api_url: str
+    aws_access_key_id: str | None
+    aws_secret_access_key: str | None
+    aws_default_region: str
+    s3_bucket_name: str | None
+    covid_date: str
+    countries: tuple[str, ...]
+    save_local_copy: bool
+    risk_thresholds: dict = field(default_factory=dict)
+
+@cache
+def get_config() -> Config:
+    """
+    Carga el `.env`, lee las variables de entorno y devuelve la configuración.
+
+    El decorador `cache` garantiza que el archivo se lee y parsea una única
+    vez por proceso, sin importar cuántas veces se llame.
+    """
+    # Carga las variables de entorno desde el archivo .env
+    load_dotenv()
+    return Config(
+        # URL base de la API de COVID
+        base_api_url=os.getenv("BASE_API_URL", "https://covid-api.com/api"),
+        # Credenciales y configuración de AWS
+        aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
+        aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
+        aws_default_region=os.getenv("AWS_DEFAULT_REGION", "us-east-1"),
+        s3_bucket_name=os.getenv("S3_BUCKET_NAME"),
+        # Fecha de consulta de datos COVID (formato YYYY-MM-DD)
+        covid_date=os.getenv("COVID_DATE", "2023-09-01"),
+        # Países a consultar (ISO-3166-1 alpha-2)
+        countries=tuple(os.getenv("COUNTRIES", "MX,CO,PE").split(",")),
+        # Guardar también una copia local del parquet además de subirlo a S3
+        save_local_copy=os.getenv("SAVE_LOCAL_COPY", "false").lower() in ("1", "true", "yes"),
+        # Umbrales de riesgo según número de casos
+        risk_thresholds={
+            "low": 100,
+            "medium": 500,
+            "high": 1000
+        },
+    )
 
-# URL base de la API de COVID
-BASE_API_URL = os.getenv("BASE_API_URL", "https://covid-api.com/api")
-# Credenciales y configuración de AWS
-AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
-AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
-AWS_DEFAULT_REGION = os.getenv("AWS_DEFAULT_REGION", "us-east-1")
-S3_BUCKET_NAME = os.getenv("S3_BUCKET_NAME")
-# Fecha de consulta de datos COVID (formato YYYY-MM-DD)
-COVID_DATE = os.getenv("COVID_DATE", "2023-09-01")
-# Lista de países a consultar (ISO-3166-1 alpha-2)
-COUNTRIES = os.getenv("COUNTRIES", "MX,CO,PE").split(",")
-# Umbrales de riesgo según número de casos
-RISK_THRESHOLDS = {
-    "low": 100,
-    "medium": 500,
-    "high": 1000
-}
+# Constantes a nivel de módulo derivadas del singleton, para mantener la
+# interfaz histórica de `from config import ...`
+_cfg = get_config()
+BASE_API_URL = _cfg.base_api_url
+AWS_ACCESS_KEY_ID = _cfg.aws_access_key_id
+AWS_SECRET_ACCESS_KEY = _cfg.aws_secret_access_key
+AWS_DEFAULT_REGION = _cfg.aws_default_region
+S3_BUCKET_NAME = _cfg.s3_bucket_name
+COVID_DATE = _cfg.covid_date
+COUNTRIES = _cfg.countries
+SAVE_LOCAL_COPY = _cfg.save_local_copy
+RISK_THRESHOLDS = _cfg.risk_thresholds
@@ -7,13 +7,52 @@ DataFrames de pandas listos para su procesamiento posterior.
 """
 import pandas as pd
 import logging
-from datetime import datetime, timedelta
 from config import BASE_API_URL
-from utils import requests_session_with_retries
+from utils import SESSION
+
+# orjson (parser JSON en C) si está disponible; stdlib json como respaldo
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
 
 # Configuración del logger para el módulo
 logger = logging.getLogger(__name__)
 
+def payload_to_df(payload, iso_country, date):
+    """
+    Convierte el payload JSON de la API en un DataFrame de pandas.
+
+    Args:
+        payload (dict): Respuesta JSON ya decodificada de la API.
+        iso_country (str): Código ISO del país, solo para los mensajes de log.
+        date (str): Fecha consultada, solo para los mensajes de log.
+
+    Returns:
+        pd.DataFrame: DataFrame con los registros de "data", o vacío si no hay datos.
+    """
+    if "data" in payload and payload["data"]:
+        data = payload["data"]
+        # json_normalize solo hace falta si hay campos anidados; para el
+        # caso común de registros planos, ensamblar las columnas una sola
+        # vez y construir el DataFrame en forma columnar evita que pandas
+        # itere la lista de dicts fila por fila
+        if not any(isinstance(v, (dict, list)) for v in data[0].values()):
+            # Unir las claves de todos los registros (no solo el primero)
+            # para no perder campos que aparezcan más adelante
+            keys = list(data[0])
+            seen = set(keys)
+            for r in data[1:]:
+                for k in r:
+                    if k not in seen:
+                        seen.add(k)
+                        keys.append(k)
+            cols = {k: [r.get(k) for r in data] for k in keys}
+            return pd.DataFrame(cols)
+        return pd.json_normalize(data)
+    logger.warning("No se encontraron datos para %s en %s", iso_country, date)
+    return pd.DataFrame()
+
 def fetch_country_confirmed(iso_country, date):
     """
     Obtiene los datos de casos confirmados de COVID para un país específico y una fecha.
@@ -36,8 +75,8 @@ def fetch_country_confirmed(iso_country, date):
          df.head()
     """
 
-    # Crear sesión de requests con reintentos automáticos
-    session = requests_session_with_retries()
+    # Reutilizar la sesión compartida con reintentos automáticos (keep-alive)
+    session = SESSION
     # Construir URL y parámetros para la API
     url = f"{BASE_API_URL}/reports"
     params = {"iso": iso_country, "date": date}
@@ -46,14 +85,9 @@ def fetch_country_confirmed(iso_country, date):
         # Realizar la solicitud GET
         resp = session.get(url, params=params, timeout=15)
         resp.raise_for_status()
-        payload = resp.json()
+        payload = _json.loads(resp.content)
         # Convertir datos JSON a DataFrame si hay información
-        if "data" in payload and payload["data"]:
-            df = pd.json_normalize(payload["data"])
-            return df
-        else:
-            logger.warning("No se encontraron datos para %s en %s", iso_country, date)
-            return pd.DataFrame()
+        return payload_to_df(payload, iso_country, date)
     except Exception as e:
         # Registrar cualquier excepción ocurrida
         logger.exception("Error obteniendo datos para %s en %s: %s", iso_country, date, e)
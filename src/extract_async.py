@@ -0,0 +1,108 @@
+"""
+Módulo de extracción asíncrona de datos COVID.
+
+Obtiene los reportes de todos los países en un único event loop con
+httpx.AsyncClient (multiplexado sobre HTTP/2), de modo que la etapa de
+extracción tarda aproximadamente lo que la petición más lenta en lugar
+de la suma de todas.
+"""
+import asyncio
+import logging
+
+import httpx
+import pandas as pd
+
+from config import BASE_API_URL
+from extract import payload_to_df
+
+# orjson (parser JSON en C) si está disponible; stdlib json como respaldo
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+# Configuración del logger para el módulo
+logger = logging.getLogger(__name__)
+
+# Política de reintentos alineada con requests_session_with_retries en
+# utils.py: 3 intentos extra con backoff exponencial ante errores transitorios
+_RETRIES = 3
+_BACKOFF_FACTOR = 0.3
+_RETRY_STATUS = (500, 502, 504)
+
+async def _fetch(client, iso_country, date):
+    """
+    Obtiene el payload JSON de un país dentro del event loop.
+
+    Reintenta hasta _RETRIES veces con backoff exponencial cuando la API
+    responde un estado transitorio (500/502/504); los errores de conexión
+    los reintenta el propio transporte del cliente.
+
+    Args:
+        client (httpx.AsyncClient): Cliente HTTP compartido del lote.
+        iso_country (str): Código ISO-3166-1 alpha-2 del país.
+        date (str): Fecha de consulta en formato "YYYY-MM-DD".
+
+    Returns:
+        dict: Payload JSON decodificado de la API.
+    """
+    for attempt in range(_RETRIES + 1):
+        resp = await client.get(f"{BASE_API_URL}/reports",
+                                params={"iso": iso_country, "date": date}, timeout=15)
+        if resp.status_code in _RETRY_STATUS and attempt < _RETRIES:
+            logger.warning("Estado %d para %s, reintento %d de %d",
+                           resp.status_code, iso_country, attempt + 1, _RETRIES)
+            await asyncio.sleep(_BACKOFF_FACTOR * (2 ** attempt))
+            continue
+        resp.raise_for_status()
+        return _json.loads(resp.content)
+
+async def fetch_many(countries, date):
+    """
+    Lanza todas las consultas de países concurrentemente en un solo cliente.
+
+    Args:
+        countries (list[str]): Códigos ISO de los países a consultar.
+        date (str): Fecha de consulta en formato "YYYY-MM-DD".
+
+    Returns:
+        list: Un payload (dict) o una excepción por país, en el mismo orden
+              que `countries` — las excepciones no cancelan al resto.
+    """
+    limits = httpx.Limits(max_connections=32, max_keepalive_connections=32)
+    # El transporte reintenta los errores de conexión; los estados
+    # transitorios los maneja _fetch
+    transport = httpx.AsyncHTTPTransport(http2=True, limits=limits, retries=_RETRIES)
+    async with httpx.AsyncClient(transport=transport) as client:
+        tasks = [_fetch(client, iso, date) for iso in countries]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+def fetch_all_confirmed(countries, date):
+    """
+    Obtiene los datos de casos confirmados de todos los países en un lote.
+
+    Args:
+        countries (list[str]): Códigos ISO de los países a consultar.
+        date (str): Fecha de consulta en formato "YYYY-MM-DD".
+
+    Returns:
+        dict[str, pd.DataFrame]: DataFrame por país. Si un país falla o no
+            tiene datos, su valor es un DataFrame vacío.
+
+    Comportamiento:
+        - Ejecuta todas las peticiones HTTP en un único event loop.
+        - Registra errores por país sin interrumpir a los demás.
+
+    Ejemplo:
+         frames = fetch_all_confirmed(["MX", "CO"], "2023-09-01")
+         frames["MX"].head()
+    """
+    results = asyncio.run(fetch_many(countries, date))
+    frames = {}
+    for iso, result in zip(countries, results):
+        if isinstance(result, Exception):
+            logger.error("Error obteniendo datos para %s en %s: %s", iso, date, result)
+            frames[iso] = pd.DataFrame()
+        else:
+            frames[iso] = payload_to_df(result, iso, date)
+    return frames
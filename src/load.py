@@ -8,15 +8,36 @@ Este módulo contiene funciones para:
 Funciones:
 - save_local_parquet: Guarda un DataFrame como parquet en la carpeta correspondiente.
 - upload_to_s3: Sube un archivo local a AWS S3.
+- save_dataset_and_upload: Escribe un dataset particionado por país y lo sube a S3.
 """
 import os
 import logging
+from functools import lru_cache
 import boto3
+from boto3.s3.transfer import TransferConfig
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 # Logger específico para la etapa de carga
 logger = logging.getLogger("etl.load")
 
+# Los parquet por país pesan muy poco: con un umbral de multipart alto y sin
+# hilos, upload_file emite un único PUT en vez de pasar por el chunking y las
+# colas del transfer manager
+_TRANSFER_CONFIG = TransferConfig(multipart_threshold=64 * 1024 * 1024, use_threads=False)
+
+@lru_cache(maxsize=4)
+def _s3_client(region=None):
+    """
+    Devuelve un cliente de S3 cacheado por región.
+
+    Construir un cliente boto3 resuelve credenciales y carga el modelo del
+    servicio en cada llamada; cachearlo permite que todas las subidas
+    compartan el mismo cliente y su pool de conexiones HTTP.
+    """
+    return boto3.client('s3', region_name=region) if region else boto3.client('s3')
+
 def save_local_parquet(df: pd.DataFrame, country: str, date_label: str, base_path="data"):
     """
     Guarda un DataFrame en formato Parquet localmente.
@@ -43,7 +64,14 @@ def save_local_parquet(df: pd.DataFrame, country: str, date_label: str, base_pat
     out_dir = os.path.join(base_path, country)
     os.makedirs(out_dir, exist_ok=True)
     out_path = os.path.join(out_dir, f"{date_label}.parquet")
-    df.to_parquet(out_path, engine="pyarrow", index=False)
+    # Escribir con pyarrow directamente, evitando la indirección de
+    # df.to_parquet (inferencia de esquema, manejo de índice, traducción de
+    # kwargs). Codec y tamaño de row-group explícitos: zstd nivel 1 comprime
+    # rápido y un único row-group evita metadatos innecesarios en archivos
+    # pequeños
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_table(table, out_path, compression="zstd", compression_level=1,
+                   row_group_size=max(1024, len(df)))
     logger.info("Guardado local parquet: %s", out_path)
     return out_path
 
@@ -65,10 +93,66 @@ def upload_to_s3(file_path: str, bucket: str, s3_key: str, aws_region=None):
     Ejemplo:
          upload_to_s3("data/MX/2023-09-01.parquet", "my-bucket", "mx/2023-09-01.parquet")
     """
-    s3 = boto3.client('s3', region_name=aws_region) if aws_region else boto3.client('s3')
+    s3 = _s3_client(aws_region)
     try:
-        s3.upload_file(file_path, bucket, s3_key)
+        s3.upload_file(file_path, bucket, s3_key, Config=_TRANSFER_CONFIG)
         logger.info("Archivo %s subido a s3://%s/%s", file_path, bucket, s3_key)
     except Exception:
         logger.exception("Error subiendo %s a S3", file_path)
         raise
+
+def save_dataset_and_upload(frames, date_label: str, bucket: str, s3_prefix: str,
+                            aws_region=None, base_path="data"):
+    """
+    Escribe todos los países como un único dataset Parquet y lo sube a S3.
+
+    Concatena los DataFrames transformados, escribe un dataset particionado
+    por país bajo "{base_path}/{date_label}/country=XX/" y sube los archivos
+    resultantes con un solo cliente. Frente a subir N parquet minúsculos de
+    forma independiente, amortiza el overhead por petición (TLS + firma)
+    sobre menos operaciones y deja un layout de dataset consultable.
+
+    Args:
+        frames (list[pd.DataFrame]): DataFrames transformados, uno por país.
+        date_label (str): Etiqueta de fecha de la corrida (ej. 'YYYY-MM-DD').
+        bucket (str): Nombre del bucket de S3.
+        s3_prefix (str): Prefijo en el bucket bajo el cual subir el dataset.
+        aws_region (str, opcional): Región de AWS. Si no se proporciona, se usa la región por defecto.
+        base_path (str, opcional): Carpeta local raíz del dataset. Por defecto 'data'.
+
+    Returns:
+        list[str]: Claves de S3 subidas. Lista vacía si no había datos.
+
+    Ejemplo:
+         save_dataset_and_upload([df_mx, df_co], "2023-09-01", "my-bucket", "covid_data/2023-09-01")
+    """
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        logger.warning("Sin datos que escribir para %s", date_label)
+        return []
+    df_all = pd.concat(frames, ignore_index=True)
+    root = os.path.join(base_path, date_label)
+    table = pa.Table.from_pandas(df_all, preserve_index=False)
+    # Nombres de archivo deterministas y borrado de particiones previas:
+    # re-ejecutar la misma fecha sobreescribe el dataset (local y en S3) en
+    # lugar de acumular un part-file nuevo con GUID por corrida
+    pq.write_to_dataset(table, root_path=root, partition_cols=["country"],
+                        compression="zstd", compression_level=1,
+                        basename_template="part-{i}.parquet",
+                        existing_data_behavior="delete_matching")
+    logger.info("Dataset local escrito en %s (%d filas)", root, len(df_all))
+    s3 = _s3_client(aws_region)
+    uploaded = []
+    try:
+        for dirpath, _, filenames in os.walk(root):
+            for name in filenames:
+                local_file = os.path.join(dirpath, name)
+                rel = os.path.relpath(local_file, root).replace(os.sep, "/")
+                s3_key = f"{s3_prefix}/{rel}"
+                s3.upload_file(local_file, bucket, s3_key, Config=_TRANSFER_CONFIG)
+                uploaded.append(s3_key)
+    except Exception:
+        logger.exception("Error subiendo dataset %s a S3", date_label)
+        raise
+    logger.info("Dataset %s subido: %d archivos a s3://%s/%s", date_label, len(uploaded), bucket, s3_prefix)
+    return uploaded
@@ -4,8 +4,8 @@ Script principal del pipeline ETL de COVID-19.
 Este módulo orquesta el flujo completo:
 1️⃣ Extracción de datos desde la API COVID.
 2️⃣ Transformación y limpieza de datos.
-3️⃣ Guardado local en formato Parquet.
-4️⃣ Subida de los archivos a AWS S3.
+3️⃣ Escritura de un único dataset Parquet particionado por país.
+4️⃣ Subida del dataset a AWS S3.
 
 El pipeline se ejecuta para todos los países definidos en la variable COUNTRIES
 y utiliza la fecha definida en COVID_DATE.
@@ -15,15 +15,43 @@ Requisitos:
 - Funciones auxiliares en extract.py, transform.py, load.py y utils.py
 """
 import logging
-from datetime import datetime, timedelta
-from extract import fetch_country_confirmed
+import tempfile
+from datetime import datetime
+import pandas as pd
+from extract_async import fetch_all_confirmed
 from transform import process_country_df
-from load import save_local_parquet, upload_to_s3
+from load import save_dataset_and_upload
 from utils import setup_logging
-from config import COUNTRIES, COVID_DATE, RISK_THRESHOLDS, S3_BUCKET_NAME, AWS_DEFAULT_REGION
+from config import COUNTRIES, COVID_DATE, RISK_THRESHOLDS, S3_BUCKET_NAME, AWS_DEFAULT_REGION, SAVE_LOCAL_COPY
 
 logger = logging.getLogger("etl")
 
+def _transform_one(iso, df_raw, window):
+    """
+    Ejecuta la transformación para un solo país ya extraído.
+
+    Args:
+        iso (str): Código ISO-3166-1 alpha-2 del país.
+        df_raw (pd.DataFrame): Datos crudos del país obtenidos por el lote async.
+        window (tuple): Límites (lo, hi) de la ventana de fechas, compartidos
+            por todos los países de la corrida.
+
+    Returns:
+        tuple: (iso, df_transformado) — df_transformado es None si el país falló.
+
+    Manejo de errores:
+    - Registra cualquier fallo durante la transformación del país.
+    - Nunca propaga la excepción, para no cancelar los demás países.
+    """
+    try:
+        logger.info("Iniciando transformación para %s — %s", iso, COVID_DATE)
+        df_transformed, totals = process_country_df(df_raw, iso, RISK_THRESHOLDS, window=window)
+        logger.info("Totales %s: %s", iso, totals)
+        return iso, df_transformed
+    except Exception:
+        logger.exception("Fallo en transformación para %s", iso)
+        return iso, None
+
 def run():
     """
     Ejecuta el pipeline ETL completo para todos los países definidos.
@@ -31,32 +59,50 @@ def run():
     Flujo:
     1. Extrae datos COVID de la API para cada país y fecha.
     2. Procesa y transforma los datos mediante `process_country_df`.
-    3. Guarda los datos transformados en formato Parquet localmente.
-    4. Sube los archivos Parquet a AWS S3.
+    3. Escribe un único dataset Parquet particionado por país.
+    4. Sube el dataset a AWS S3 en una sola operación de carga.
+
+    La extracción se ejecuta como un único lote asíncrono (httpx + asyncio),
+    de modo que todas las peticiones HTTP comparten un event loop y la etapa
+    tarda lo que la petición más lenta. La transformación es trabajo de
+    pandas ligado a CPU, así que corre secuencialmente, y la carga agrupa
+    todos los países en un solo dataset en lugar de N archivos minúsculos
+    subidos uno a uno.
 
     Manejo de errores:
     - Registra cualquier fallo durante el pipeline para un país específico.
     - Continúa con el siguiente país aunque falle alguno.
-    
+
     """
+    # Ventana de 30 días calculada una sola vez, compartida por todos los
+    # países para que usen exactamente el mismo rango de fechas
+    hi = pd.Timestamp(datetime.today())
+    lo = hi - pd.Timedelta(days=30)
+    # 1️⃣ Extracción en lote de todos los países
+    frames = fetch_all_confirmed(COUNTRIES, COVID_DATE)
+    # 2️⃣ Transformación (trabajo de pandas ligado a CPU: los hilos no
+    # aportan solapamiento aquí, así que se procesa país por país)
+    transformed = []
     for iso in COUNTRIES:
-        try:
-            logger.info("Iniciando pipeline para %s — %s a %s", iso, COVID_DATE)
-            # 1️⃣ Extracción
-            df_raw = fetch_country_confirmed(iso, COVID_DATE)
-            # 2️⃣ Transformación
-            df_transformed, totals = process_country_df(df_raw, iso, RISK_THRESHOLDS)
-            # 3️⃣ Guardado local
-            local_path = save_local_parquet(df_transformed, iso, COVID_DATE)
-            # 4️⃣ Subida a S3
-            s3_key = f"covid_data/{iso}/{COVID_DATE}.parquet"
-            try:
-                upload_to_s3(local_path, S3_BUCKET_NAME, s3_key, aws_region=AWS_DEFAULT_REGION)
-                logger.info("Archivo subido a S3: %s", s3_key)
-            except Exception as e:
-                logger.exception("Error al subir %s a S3: %s", iso, e)
-        except Exception:
-            logger.exception("Fallo en pipeline para %s", iso)
+        iso, df_transformed = _transform_one(iso, frames[iso], (lo, hi))
+        if df_transformed is not None:
+            transformed.append(df_transformed)
+        logger.info("Transformación para %s finalizada: %s", iso,
+                    "ok" if df_transformed is not None else "error")
+    # 3️⃣+4️⃣ Dataset combinado y subida a S3 (copia local solo si
+    # SAVE_LOCAL_COPY está activo; si no, se usa un directorio temporal)
+    s3_prefix = f"covid_data/{COVID_DATE}"
+    try:
+        if SAVE_LOCAL_COPY:
+            save_dataset_and_upload(transformed, COVID_DATE, S3_BUCKET_NAME,
+                                    s3_prefix, aws_region=AWS_DEFAULT_REGION)
+        else:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                save_dataset_and_upload(transformed, COVID_DATE, S3_BUCKET_NAME,
+                                        s3_prefix, aws_region=AWS_DEFAULT_REGION,
+                                        base_path=tmp_dir)
+    except Exception as e:
+        logger.exception("Error al subir el dataset %s a S3: %s", COVID_DATE, e)
 
 if __name__ == "__main__":
     run()
@@ -7,13 +7,20 @@ Funciones para:
 - Calcular métricas como casos nuevos, tasa de crecimiento y clasificación de riesgo.
 
 """
-from datetime import datetime, timedelta
+from datetime import datetime
+import numpy as np
 import pandas as pd
 import re
 import logging
 
 logger = logging.getLogger("etl.transform")
 
+# Patrones compilados una sola vez al importar el módulo, en lugar de pasar
+# por la caché interna de re.sub en cada llamada
+_RE_CAMEL_1 = re.compile(r'(.)([A-Z][a-z]+)')
+_RE_CAMEL_2 = re.compile(r'([a-z0-9])([A-Z])')
+_RE_INVALID = re.compile(r'[^0-9a-zA-Z_]+')
+
 def to_snake_case(s: str) -> str:
     """
     Convierte un string a formato snake_case.
@@ -23,12 +30,15 @@ def to_snake_case(s: str) -> str:
 
     Returns:
         str: Texto en snake_case, sin caracteres especiales.
-    
+
     """
-    s = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', s)
-    s = re.sub('([a-z0-9])([A-Z])', r'\1_\2', s)
+    # Atajo: si ya está en snake_case no hay nada que transformar
+    if s.islower() and s.isidentifier():
+        return s
+    s = _RE_CAMEL_1.sub(r'\1_\2', s)
+    s = _RE_CAMEL_2.sub(r'\1_\2', s)
     s = s.replace(" ", "_")
-    s = re.sub(r'[^0-9a-zA-Z_]+', "", s)
+    s = _RE_INVALID.sub("", s)
     return s.lower()
 
 def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
@@ -39,13 +49,15 @@ def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
         df (pd.DataFrame): DataFrame original.
 
     Returns:
-        pd.DataFrame: DataFrame con nombres de columnas normalizados.
+        pd.DataFrame: DataFrame con nombres de columnas normalizados. Si ya
+        están todos en snake_case, se devuelve el mismo DataFrame sin copiar.
     """
-    df = df.copy()
-    df.columns = [to_snake_case(c) for c in df.columns]
-    return df
+    renames = {c: to_snake_case(c) for c in df.columns}
+    if all(c == nc for c, nc in renames.items()):
+        return df
+    return df.rename(columns=renames)
 
-def process_country_df(df: pd.DataFrame, country: str, risk_thresholds: dict):
+def process_country_df(df: pd.DataFrame, country: str, risk_thresholds: dict, window=None):
     """
     Procesa un DataFrame por país, calculando métricas y clasificando riesgo.
 
@@ -61,6 +73,10 @@ def process_country_df(df: pd.DataFrame, country: str, risk_thresholds: dict):
         df (pd.DataFrame): DataFrame crudo de la API.
         country (str): Código ISO del país.
         risk_thresholds (dict): Umbrales para clasificar riesgo ('low', 'medium', 'high').
+        window (tuple, opcional): Límites (lo, hi) de la ventana de fechas.
+            Si no se pasa, se calculan los últimos 30 días desde hoy. Pasar la
+            misma ventana a todos los países evita que cada llamada recalcule
+            la fecha y use ventanas ligeramente distintas.
 
     Returns:
         tuple: (df_transformado, totales)
@@ -76,11 +92,13 @@ def process_country_df(df: pd.DataFrame, country: str, risk_thresholds: dict):
     date_col = next((c for c in df.columns if "date" in c), df.columns[0])
     df[date_col] = pd.to_datetime(df[date_col])
 
-    # Filtrar últimos 30 días
-    today = datetime.today()
-    last_30_days = today - timedelta(days=30)
-    df = df[(df[date_col] >= last_30_days) & (df[date_col] <= today)]
-    df[date_col] = pd.to_datetime(df[date_col])
+    # Filtrar la ventana de fechas (por defecto, últimos 30 días)
+    if window is None:
+        hi = pd.Timestamp(datetime.today())
+        lo = hi - pd.Timedelta(days=30)
+    else:
+        lo, hi = window
+    df = df[(df[date_col] >= lo) & (df[date_col] <= hi)]
 
     # detectar columna de confirmados
     if "confirmed" not in df.columns and "cases" in df.columns:
@@ -88,28 +106,29 @@ def process_country_df(df: pd.DataFrame, country: str, risk_thresholds: dict):
     if "confirmed" not in df.columns:
         df["confirmed"] = 0
 
-    df["confirmed"] = df["confirmed"].fillna(0).astype(int)
+    df["confirmed"] = df["confirmed"].fillna(0).astype("int32")
     df = df.sort_values(date_col)
 
-    # Calcular casos nuevos y casos previos
-    df["new_cases"] = df["confirmed"].diff().fillna(df["confirmed"]).astype(int)
-    df["prev_confirmed"] = df["confirmed"].shift(1).fillna(0).astype(int)
-
-    # Calcular tasa de crecimiento de forma segura
-    def safe_growth(new_cases, prev):
-        return (new_cases / prev) if prev > 0 else 0.0
-
-    df["growth_rate"] = df.apply(lambda r: safe_growth(r["new_cases"], r["prev_confirmed"]), axis=1)
-    # Clasificar riesgo según casos nuevos y umbrales
-    def classify(n):
-        if n > risk_thresholds.get("medium", 10000):
-            return "alto"
-        if n > risk_thresholds.get("low", 1000):
-            return "medio"
-        return "bajo"
-
-    df["risk"] = df["new_cases"].apply(classify)
-    df["country"] = country
+    # Calcular casos nuevos y casos previos en una sola pasada sobre el
+    # array, en lugar de recorrer la columna dos veces con diff() y shift()
+    confirmed = df["confirmed"].to_numpy(dtype=np.int32)
+    prev = np.empty_like(confirmed)
+    prev[:1] = 0
+    prev[1:] = confirmed[:-1]
+    new = confirmed - prev  # en la primera fila prev es 0, new == confirmed
+    df["prev_confirmed"] = prev
+    df["new_cases"] = new
+
+    # Calcular tasa de crecimiento de forma segura (vectorizado con NumPy,
+    # evita invocar Python por cada fila como hace apply)
+    df["growth_rate"] = np.where(prev > 0, new / np.where(prev > 0, prev, 1), 0.0).astype("float32")
+    # Clasificar riesgo según casos nuevos y umbrales (pd.cut hace el
+    # bucketing vectorizado en una sola pasada, sin callbacks de Python)
+    bins = [-np.inf, risk_thresholds.get("low", 1000), risk_thresholds.get("medium", 10000), np.inf]
+    df["risk"] = pd.cut(df["new_cases"], bins=bins, labels=["bajo", "medio", "alto"]).astype(str)
+    # Columna categórica: Parquet la codifica como diccionario en lugar de
+    # repetir el string en cada fila
+    df["country"] = pd.Categorical([country] * len(df))
     # Totales por país
     totals = {
         "country": country,
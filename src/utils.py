@@ -37,7 +37,7 @@ def setup_logging(log_path="logs/etl.log"):
     )
     return logging.getLogger("etl")
 
-def requests_session_with_retries(retries=3, backoff_factor=0.3, status_forcelist=(500,502,504)):
+def requests_session_with_retries(retries=3, backoff_factor=0.3, status_forcelist=(500,502,504), pool_size=32):
     """
     Crea una sesión HTTP con reintentos automáticos para solicitudes robustas.
 
@@ -45,6 +45,8 @@ def requests_session_with_retries(retries=3, backoff_factor=0.3, status_forcelis
         retries (int, opcional): Número total de reintentos. Por defecto 3.
         backoff_factor (float, opcional): Factor de retroceso exponencial entre intentos. Por defecto 0.3.
         status_forcelist (tuple, opcional): Códigos de estado HTTP que disparan un reintento. Por defecto (500,502,504).
+        pool_size (int, opcional): Tamaño del pool de conexiones del adaptador. Por defecto 32,
+            para que las consultas concurrentes por país no se serialicen en el pool.
 
     Returns:
         requests.Session: Sesión de requests configurada con reintentos.
@@ -65,7 +67,12 @@ def requests_session_with_retries(retries=3, backoff_factor=0.3, status_forcelis
         status_forcelist=status_forcelist,
         allowed_methods=frozenset(["GET","POST"])
     )
-    adapter = HTTPAdapter(max_retries=retry)
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_size, pool_maxsize=pool_size)
     session.mount("https://", adapter)
     session.mount("http://", adapter)
     return session
+
+# Sesión compartida a nivel de módulo: reutiliza el pool de conexiones TCP/TLS
+# (keep-alive) entre todas las consultas de países, evitando reconstruir la
+# sesión y renegociar TLS en cada llamada.
+SESSION = requests_session_with_retries()